@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+SimpleMem Cache - Two-Tier Embedding Cache
+==========================================
+
+Embeddings are the most expensive per-text step in SimpleMem's compression
+and retrieval stages, and the same dialogue snippets and queries are embedded
+again and again across tool calls and benchmark replays.
+
+CachedEmbedder sits in front of any embedding function:
+1. In-process LRU (LRUEmbeddingCache) with optional TTL
+2. On-disk SQLite table shared across processes and restarts
+3. The underlying embedding function, only on a miss in both tiers
+
+Entries are keyed by a BLAKE2b digest of (model, text), so switching models
+never serves stale vectors.
+
+Author: Tanya (Stanford Biomedical Data Science)
+Based on: SimpleMem by Liu et al. (2025)
+License: MIT
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def embedding_key(text: str, model: str) -> bytes:
+    """Cache key for `text` embedded by `model`"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(model.encode("utf-8"))
+    h.update(b"\0")
+    h.update(text.encode("utf-8"))
+    return h.digest()
+
+
+class LRUEmbeddingCache:
+    """
+    Thread-safe in-process LRU of embedding vectors.
+
+    Parameters:
+    - capacity: maximum number of vectors kept
+    - ttl: seconds an entry stays valid (None = forever)
+    """
+    def __init__(self, capacity: int = 10_000, ttl: Optional[float] = 3600):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, vec = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return vec
+
+    def put(self, key: bytes, vec: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedEmbedder:
+    """
+    Embedding function wrapped in an LRU + on-disk SQLite cache.
+
+    Parameters:
+    - embed_fn: text -> 1-d float vector (the expensive provider call)
+    - model: model identifier, part of every cache key
+    - cache_dir: directory for `embeddings.sqlite` (None = memory only)
+    - capacity, ttl: LRUEmbeddingCache settings
+    - embed_batch_fn: texts -> (N, dim) matrix in one provider call; used by
+      embed_many / embed_many_with_stats (falls back to embed_fn per text)
+    - max_batch: most texts sent to embed_batch_fn per call
+    """
+    def __init__(
+        self,
+        embed_fn: Callable[[str], np.ndarray],
+        model: str,
+        cache_dir: Optional[str] = None,
+        capacity: int = 10_000,
+        ttl: Optional[float] = 3600,
+        embed_batch_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+        max_batch: int = 2048
+    ):
+        self.embed_fn = embed_fn
+        self.embed_batch_fn = embed_batch_fn
+        self.max_batch = max_batch
+        self.model = model
+        self.lru = LRUEmbeddingCache(capacity, ttl)
+        # Running totals across all calls and threads (guarded by _stats_lock)
+        self.stats: Dict[str, int] = {"lru_hits": 0, "disk_hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if cache_dir is not None:
+            path = Path(cache_dir)
+            path.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path / "embeddings.sqlite"), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key BLOB PRIMARY KEY, dtype TEXT NOT NULL, vec BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    def _disk_get(self, key: bytes) -> Optional[np.ndarray]:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT dtype, vec FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[1], dtype=row[0])
+
+    def _disk_get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        if self._db is None or not keys:
+            return {}
+        found: Dict[bytes, np.ndarray] = {}
+        with self._db_lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    "SELECT key, dtype, vec FROM embeddings WHERE key IN "
+                    f"({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, dtype, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=dtype)
+        return found
+
+    def _disk_put(self, key: bytes, vec: np.ndarray) -> None:
+        self._disk_put_many([(key, vec)])
+
+    def _disk_put_many(self, items: Sequence[Tuple[bytes, np.ndarray]]) -> None:
+        if self._db is None or not items:
+            return
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dtype, vec) VALUES (?, ?, ?)",
+                [(key, vec.dtype.str, vec.tobytes()) for key, vec in items]
+            )
+            self._db.commit()
+
+    def _count(self, call_stats: Dict[str, int]) -> None:
+        """Add one call's lru_hits / disk_hits / misses to the running stats"""
+        with self._stats_lock:
+            for name, n in call_stats.items():
+                self.stats[name] += n
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embedding of `text`, checking LRU -> disk -> embed_fn.
+
+        Returned arrays are read-only: they are shared with the cache.
+        """
+        key = embedding_key(text, self.model)
+        vec = self.lru.get(key)
+        if vec is not None:
+            self._count({"lru_hits": 1})
+            return vec
+        vec = self._disk_get(key)
+        if vec is not None:
+            self._count({"disk_hits": 1})
+        else:
+            self._count({"misses": 1})
+            vec = np.ascontiguousarray(self.embed_fn(text))
+            self._disk_put(key, vec)
+        vec.setflags(write=False)
+        self.lru.put(key, vec)
+        return vec
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeddings of all `texts` as an (N, dim) matrix (see embed_many_with_stats)"""
+        return self.embed_many_with_stats(texts)[0]
+
+    def embed_many_with_stats(self, texts: Sequence[str]) -> Tuple[np.ndarray, Dict[str, int]]:
+        """
+        Embeddings of all `texts` as an (N, dim) matrix, plus this call's
+        cache counts.
+
+        Cache lookups are done for the whole list up front; the distinct
+        misses then go to embed_batch_fn in as few calls as max_batch allows,
+        instead of one provider round trip per text.
+
+        Returns:
+        - (matrix, {lru_hits, disk_hits, misses}); counts are per distinct
+          text, so they sum to the number of distinct texts (repeats within
+          the call are served from the first occurrence)
+        """
+        keys = [embedding_key(text, self.model) for text in texts]
+        call_stats = {"lru_hits": 0, "disk_hits": 0, "misses": 0}
+        vecs: Dict[bytes, np.ndarray] = {}
+        pending: List[bytes] = []
+        for key in dict.fromkeys(keys):
+            vec = self.lru.get(key)
+            if vec is not None:
+                vecs[key] = vec
+            else:
+                pending.append(key)
+        call_stats["lru_hits"] = len(vecs)
+        from_disk = self._disk_get_many(pending)
+        call_stats["disk_hits"] = len(from_disk)
+        vecs.update(from_disk)
+
+        text_of = dict(zip(keys, texts))
+        missing = [k for k in pending if k not in from_disk]
+        call_stats["misses"] = len(missing)
+        computed: List[Tuple[bytes, np.ndarray]] = []
+        for start in range(0, len(missing), self.max_batch):
+            chunk = missing[start:start + self.max_batch]
+            chunk_texts = [text_of[k] for k in chunk]
+            if self.embed_batch_fn is not None:
+                mat = self.embed_batch_fn(chunk_texts)
+            else:
+                mat = [self.embed_fn(t) for t in chunk_texts]
+            computed.extend((k, np.ascontiguousarray(v)) for k, v in zip(chunk, mat))
+        self._disk_put_many(computed)
+        vecs.update(computed)
+        self._count(call_stats)
+
+        for key in pending:
+            vecs[key].setflags(write=False)
+            self.lru.put(key, vecs[key])
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32), call_stats
+        return np.stack([vecs[k] for k in keys]), call_stats
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
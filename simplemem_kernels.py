@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+SimpleMem Kernels - Numeric Hot Paths for Retrieval
+===================================================
+
+Array kernels used by SimpleMem's multi-view hybrid retrieval
+(semantic + lexical + symbolic), kept free of Python objects so they can be
+compiled with Numba.
+
+Numba is optional: when it is not installed the same functions run as plain
+NumPy/Python code with identical results, just slower.
+
+Author: Tanya (Stanford Biomedical Data Science)
+Based on: SimpleMem by Liu et al. (2025)
+License: MIT
+"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Optional JIT compilation (pip install numba)
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is unavailable"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# Reciprocal Rank Fusion constant recommended by Cormack et al. (2009)
+RRF_K = 60
+
+# BM25 parameters (Robertson & Zaragoza defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def rrf_merge(
+    ranked_ids: Sequence[np.ndarray],
+    n_docs: int,
+    top_k: int,
+    k: int = RRF_K
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge per-view ranked result lists with Reciprocal Rank Fusion.
+
+    Each view's contribution 1 / (k + rank) is computed for its whole list at
+    once and scatter-added into one dense score array, so there is no
+    per-document Python work.
+
+    Parameters:
+    - ranked_ids: one array of document ids per view, best first
+    - n_docs: total number of documents (ids are 0..n_docs-1)
+    - top_k: number of fused results to return
+    - k: RRF smoothing constant
+
+    Returns:
+    - (doc_ids, scores) of the top_k fused results, best first; documents
+      no view returned are never included
+    """
+    scores = np.zeros(n_docs)
+    for ids in ranked_ids:
+        ids = np.asarray(ids, dtype=np.int64)
+        np.add.at(scores, ids, 1.0 / (k + np.arange(1, len(ids) + 1, dtype=np.float64)))
+    top, top_scores = topk(scores, top_k)
+    keep = top_scores > 0
+    return top[keep], top_scores[keep]
+
+
+@njit(cache=True, parallel=True)
+def bm25_scores(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+    doc_lens: np.ndarray,
+    idf: np.ndarray,
+    query_terms: np.ndarray,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+    avgdl: float = 1.0
+) -> np.ndarray:
+    """
+    BM25 score of every document for a query, over a CSR term-frequency matrix.
+
+    Documents are scored in parallel (numba.prange); each only walks its own
+    non-zero terms, so cost is O(nnz) regardless of vocabulary size.
+
+    Parameters:
+    - indptr, indices, data: doc-major CSR matrix (int32 indptr/indices of
+      term ids, float32 term frequencies)
+    - doc_lens: float32 token count per document
+    - idf: float32 inverse document frequency per term id
+    - query_terms: int32 term ids of the query (duplicates are ignored)
+    - k1, b: BM25 parameters
+    - avgdl: average document length
+
+    Returns:
+    - float32 array of per-document scores
+    """
+    n_docs = doc_lens.shape[0]
+    q_idf = np.zeros(idf.shape[0], dtype=np.float32)
+    for t in query_terms:
+        q_idf[t] = idf[t]
+    scores = np.zeros(n_docs, dtype=np.float32)
+    for d in prange(n_docs):
+        norm = k1 * (1.0 - b + b * doc_lens[d] / avgdl)
+        s = 0.0
+        for j in range(indptr[d], indptr[d + 1]):
+            w = q_idf[indices[j]]
+            if w > 0.0:
+                tf = data[j]
+                s += w * tf * (k1 + 1.0) / (tf + norm)
+        scores[d] = s
+    return scores
+
+
+@njit(cache=True)
+def _heap_worse(v1, i1, v2, i2) -> bool:
+    """Heap order: lower score is worse; on ties the later index is worse"""
+    return v1 < v2 or (v1 == v2 and i1 > i2)
+
+
+@njit(cache=True)
+def _heap_sift_down(heap_vals, heap_idx, size, v, i) -> None:
+    """Place (v, i) at the root of a min-heap of `size` entries and sift it down"""
+    pos = 0
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        right = child + 1
+        if right < size and _heap_worse(heap_vals[right], heap_idx[right], heap_vals[child], heap_idx[child]):
+            child = right
+        if _heap_worse(v, i, heap_vals[child], heap_idx[child]):
+            break
+        heap_vals[pos] = heap_vals[child]
+        heap_idx[pos] = heap_idx[child]
+        pos = child
+    heap_vals[pos] = v
+    heap_idx[pos] = i
+
+
+@njit(cache=True)
+def _topk_heap(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k by a size-k min-heap: O(N log k) instead of a full O(N log N) sort"""
+    k = min(k, scores.shape[0])
+    heap_vals = np.empty(max(k, 0), dtype=scores.dtype)
+    heap_idx = np.empty(max(k, 0), dtype=np.int64)
+    if k <= 0:
+        return heap_idx, heap_vals
+    # Fill with the first k entries, sifting each one up
+    for i in range(k):
+        v = scores[i]
+        pos = i
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if not _heap_worse(v, i, heap_vals[parent], heap_idx[parent]):
+                break
+            heap_vals[pos] = heap_vals[parent]
+            heap_idx[pos] = heap_idx[parent]
+            pos = parent
+        heap_vals[pos] = v
+        heap_idx[pos] = i
+    # Later entries only enter by beating the current worst (the root)
+    for i in range(k, scores.shape[0]):
+        if scores[i] > heap_vals[0]:
+            _heap_sift_down(heap_vals, heap_idx, k, scores[i], i)
+    # Pop worst-first into the tail to get best-first order
+    out_idx = np.empty(k, dtype=np.int64)
+    out_vals = np.empty(k, dtype=scores.dtype)
+    for size in range(k, 0, -1):
+        out_idx[size - 1] = heap_idx[0]
+        out_vals[size - 1] = heap_vals[0]
+        if size > 1:
+            _heap_sift_down(heap_vals, heap_idx, size - 1, heap_vals[size - 1], heap_idx[size - 1])
+    return out_idx, out_vals
+
+
+def _topk_numpy(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k by np.partition (introselect) plus a sort of the k survivors"""
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    # k-th largest value; entries tied with it are taken lowest index first
+    threshold = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    idx = np.concatenate((above, ties))
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return idx, scores[idx]
+
+
+# topk(scores, k) -> (indices, values), best first, ties broken by lower index.
+# The heap kernel is only worth it compiled; otherwise use NumPy's introselect.
+topk = _topk_heap if HAVE_NUMBA else _topk_numpy
+
+
+def quantize_rows(mat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization: codes = round(v * 127 / max|v|).
+
+    Parameters:
+    - mat: float array of shape (n, dim)
+
+    Returns:
+    - (codes, scales): int8 (n, dim) codes and float32 (n,) scales with
+      mat ≈ codes * scales[:, None]; all-zero rows get scale 0
+    """
+    mat = np.asarray(mat, dtype=np.float32)
+    peak = np.abs(mat).max(axis=1)
+    scales = (peak / 127.0).astype(np.float32)
+    inv = np.divide(1.0, scales, out=np.zeros_like(scales), where=scales > 0)
+    codes = np.rint(mat * inv[:, None]).astype(np.int8)
+    return codes, scales
+
+
+@njit(cache=True, parallel=True)
+def _int8_scores_jit(codes, scales, q_codes, q_scale) -> np.ndarray:
+    """Row-parallel int8 dot products accumulated in int32"""
+    n, dim = codes.shape
+    out = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        acc = 0
+        for j in range(dim):
+            acc += np.int32(codes[i, j]) * np.int32(q_codes[j])
+        out[i] = acc * scales[i] * q_scale
+    return out
+
+
+def _int8_scores_numpy(codes, scales, q_codes, q_scale) -> np.ndarray:
+    """Blocked int8 dot products; each block is widened to int32 for the matmul"""
+    q = q_codes.astype(np.int32)
+    out = np.empty(codes.shape[0], dtype=np.float32)
+    for start in range(0, codes.shape[0], 4096):
+        block = codes[start:start + 4096].astype(np.int32)
+        out[start:start + 4096] = (block @ q) * scales[start:start + 4096] * q_scale
+    return out
+
+
+# int8_scores(codes, scales, q_codes, q_scale) -> float32 dot products of the
+# dequantized rows with the dequantized query, one per row.
+int8_scores = _int8_scores_jit if HAVE_NUMBA else _int8_scores_numpy
+
+
+@njit(cache=True, parallel=True)
+def _fused_scan_jit(
+    codes, scales, q_codes, q_scale, semantic,
+    indptr, indices, tf, doc_lens, idf, query_terms, k1, b, avgdl,
+    sym_indptr, sym_indices, n_symbols, query_symbols
+) -> np.ndarray:
+    """All three view scores in one row-parallel pass over the facts"""
+    n = doc_lens.shape[0]
+    q_idf = np.zeros(idf.shape[0], dtype=np.float32)
+    for t in query_terms:
+        q_idf[t] = idf[t]
+    q_sym = np.zeros(n_symbols, dtype=np.bool_)
+    for s in query_symbols:
+        q_sym[s] = True
+    out = np.zeros((3, n), dtype=np.float32)
+    for d in prange(n):
+        if semantic:
+            acc = 0
+            for j in range(codes.shape[1]):
+                acc += np.int32(codes[d, j]) * np.int32(q_codes[j])
+            out[0, d] = acc * scales[d] * q_scale
+        norm = k1 * (1.0 - b + b * doc_lens[d] / avgdl)
+        lex = 0.0
+        for j in range(indptr[d], indptr[d + 1]):
+            w = q_idf[indices[j]]
+            if w > 0.0:
+                lex += w * tf[j] * (k1 + 1.0) / (tf[j] + norm)
+        out[1, d] = lex
+        sym = 0
+        for j in range(sym_indptr[d], sym_indptr[d + 1]):
+            if q_sym[sym_indices[j]]:
+                sym += 1
+        out[2, d] = sym
+    return out
+
+
+def _fused_scan_numpy(
+    codes, scales, q_codes, q_scale, semantic,
+    indptr, indices, tf, doc_lens, idf, query_terms, k1, b, avgdl,
+    sym_indptr, sym_indices, n_symbols, query_symbols
+) -> np.ndarray:
+    """Per-view fallback: the int8, BM25 and symbol-count passes run one after another"""
+    n = doc_lens.shape[0]
+    out = np.zeros((3, n), dtype=np.float32)
+    if semantic:
+        out[0] = _int8_scores_numpy(codes, scales, q_codes, q_scale)
+    out[1] = bm25_scores(indptr, indices, tf, doc_lens, idf, query_terms, k1, b, avgdl)
+    hits = np.concatenate(([0], np.cumsum(np.isin(sym_indices, query_symbols))))
+    out[2] = hits[sym_indptr[1:]] - hits[sym_indptr[:-1]]
+    return out
+
+
+# fused_scan(codes, scales, q_codes, q_scale, semantic,
+#            indptr, indices, tf, doc_lens, idf, query_terms, k1, b, avgdl,
+#            sym_indptr, sym_indices, n_symbols, query_symbols) -> float32 (3, N)
+#
+# Semantic (int8 dot), lexical (BM25) and symbolic (matching metadata count)
+# scores of every fact, rows 0-2. Compiled, each fact's embedding row, BM25
+# postings and symbol ids are read in a single parallel pass instead of one
+# pass per view. `semantic=False` leaves row 0 zero (e.g. when an ANN index
+# serves that view). sym_indptr/sym_indices are a doc-major CSR of int32
+# symbol ids (entities, dates) in [0, n_symbols); query_symbols holds the
+# query's ids. Other arguments are as for int8_scores and bm25_scores.
+fused_scan = _fused_scan_jit if HAVE_NUMBA else _fused_scan_numpy
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+def warm_kernels() -> None:
+    """
+    Compile (or load from Numba's on-disk cache) the JIT kernels a retrieval
+    query runs, for the argument types it passes, so the first real query does
+    not pay for it.
+
+    Index arrays are read-only (MultiViewIndex freezes them and memory-maps
+    cached ones read-only), and Numba compiles read-only and writable arrays
+    as separate signatures, so the warm-up uses read-only index arrays too.
+
+    A no-op without Numba. Safe to run in a background thread.
+    """
+    if not HAVE_NUMBA:
+        return
+    _fused_scan_jit(
+        _readonly(np.zeros((1, 1), dtype=np.int8)), _readonly(np.ones(1, dtype=np.float32)),
+        np.zeros(1, dtype=np.int8), np.float32(1.0), True,
+        _readonly(np.zeros(2, dtype=np.int32)), _readonly(np.zeros(0, dtype=np.int32)),
+        _readonly(np.zeros(0, dtype=np.float32)), _readonly(np.ones(1, dtype=np.float32)),
+        _readonly(np.zeros(1, dtype=np.float32)), np.zeros(1, dtype=np.int32),
+        BM25_K1, BM25_B, 1.0,
+        _readonly(np.zeros(2, dtype=np.int32)), _readonly(np.zeros(0, dtype=np.int32)),
+        1, np.zeros(0, dtype=np.int32)
+    )
+    # float32: per-view scores; float64: RRF scores
+    for dtype in (np.float32, np.float64):
+        _topk_heap(np.zeros(1, dtype=dtype), 1)
@@ -18,11 +18,23 @@ License: MIT
 """
 
 import asyncio
+import atexit
 import json
 import logging
+import os
+import sys
+from array import array
+from dataclasses import asdict, dataclass, fields
+from functools import cache, lru_cache
+from itertools import islice
+from logging.handlers import MemoryHandler
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from time import time_ns
+from typing import Callable, Iterable, List, Dict, Any, Optional
 from pathlib import Path
+from textwrap import dedent
+
+from simplemem_temporal import epoch_us
 
 # MCP Server framework
 try:
@@ -33,13 +45,78 @@ except ImportError:
     print("ERROR: mcp package not found. Install with: pip install mcp")
     exit(1)
 
+# Optional Arrow export of the atom store (pip install pyarrow)
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Optional compiled JSON-schema validation of tool arguments (pip install fastjsonschema)
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Optional C-accelerated JSON encoder (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Records are buffered in memory and written to stderr in batches of up to
+# 1024, so heavy ingest does not cost one write() per log line. WARNING and
+# above flush the buffer immediately; anything left is flushed at exit.
+_stderr_handler = logging.StreamHandler()
+_stderr_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 )
+_log_buffer = MemoryHandler(
+    capacity=1024,
+    flushLevel=logging.WARNING,
+    target=_stderr_handler
+)
+logging.basicConfig(level=logging.INFO, handlers=[_log_buffer])
+atexit.register(_log_buffer.flush)
 logger = logging.getLogger("simplemem-mcp")
 
+
+def _make_response(obj: Any) -> TextContent:
+    """
+    Wrap a tool result as indented JSON text content.
+    
+    orjson encodes straight to UTF-8 bytes in C, so the only extra step is a
+    single decode; MCP's TextContent only carries str, so that is unavoidable.
+    NumPy arrays and scalars are serialized natively. Falls back to the
+    stdlib json module when orjson is not installed.
+    """
+    if orjson is not None:
+        text = orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        ).decode("utf-8")
+    else:
+        text = json.dumps(obj, indent=2)
+    return TextContent(type="text", text=text)
+
+
+@dataclass(slots=True, frozen=True)
+class Atom:
+    """A single atomic memory entry (row view of the atom store)"""
+    speaker: str
+    fact: str
+    timestamp: str
+    embedding_id: str
+
+
+# Column names of the atomic memory store (one list per Atom field)
+_ATOM_FIELDS = tuple(f.name for f in fields(Atom))
+
+# On-disk atom log layout (atoms.arrow): the Atom columns plus parsed timestamps
+_ATOM_LOG_SCHEMA = (
+    pa.schema([(field, pa.string()) for field in _ATOM_FIELDS] + [("ts_us", pa.int64())])
+    if pa is not None else None
+)
+
 # Mock SimpleMem implementation for demonstration
 # In production, this would import from the actual SimpleMem package
 class MockSimpleMemSystem:
@@ -47,37 +124,86 @@ class MockSimpleMemSystem:
     Mock SimpleMem system for demonstration.
     In production, replace with actual SimpleMem implementation.
     """
+    __slots__ = (
+        "db_path",
+        "_speakers",
+        "_contents",
+        "_timestamps",
+        "_ts_us",
+        "_atoms",
+        "_atom_ts_us",
+        "_display_lines",
+        "metadata",
+        "_memory_version",
+        "_ask_cached",
+        "_log_path",
+    )
+    
     def __init__(self, db_path: str = "./lancedb_data", clear_db: bool = False):
         self.db_path = db_path
-        self.dialogue_buffer = []
-        self.memory_entries = []
+        # Buffered dialogues are kept as parallel columns (speaker, content,
+        # timestamp) rather than one dict per turn.
+        self._speakers: List[str] = []
+        self._contents: List[str] = []
+        self._timestamps: List[str] = []
+        # Timestamps parsed once at ingest into int64 epoch microseconds; the
+        # ISO strings are kept for display only. Temporal filters compare ints.
+        self._ts_us = array("q")
+        # Atomic memory entries are stored column-wise, which keeps slicing
+        # cheap and maps directly onto an Arrow table / LanceDB dataset.
+        self._atoms: Dict[str, List[str]] = {field: [] for field in _ATOM_FIELDS}
+        self._atom_ts_us = array("q")
+        # Rendered "[timestamp] speaker: fact" line per entry, parallel to
+        # the atom columns, so ask() does no per-query formatting.
+        self._display_lines: List[str] = []
         self.metadata = {
             "total_dialogues": 0,
             "total_atoms": 0,
-            "last_finalized": None
+            "last_finalized_ns": None
         }
+        # Bumped whenever the atom store changes; part of the ask() cache key
+        # so answers computed against older memory are never returned.
+        self._memory_version = 0
+        self._ask_cached = lru_cache(maxsize=512)(self._answer)
+        # Append-only Arrow IPC stream of finalized atoms (needs pyarrow)
+        self._log_path = Path(db_path) / "atoms.arrow"
+        if clear_db:
+            self._log_path.unlink(missing_ok=True)
+        elif pa is not None and self._log_path.exists():
+            self._restore_atoms()
         logger.info(f"Initialized MockSimpleMemSystem with db_path={db_path}")
     
     def add_dialogue(self, speaker: str, content: str, timestamp: str) -> Dict[str, Any]:
         """Add a single dialogue to the buffer"""
-        dialogue = {
-            "speaker": speaker,
-            "content": content,
-            "timestamp": timestamp
-        }
-        self.dialogue_buffer.append(dialogue)
+        ts_us = epoch_us(timestamp)
+        # Speakers come from a small closed set; interning lets every atom
+        # share one string object per speaker.
+        self._speakers.append(sys.intern(speaker))
+        self._contents.append(content)
+        self._timestamps.append(timestamp)
+        self._ts_us.append(ts_us)
         self.metadata["total_dialogues"] += 1
-        logger.info(f"Added dialogue from {speaker}: {content[:50]}...")
-        return {"status": "buffered", "dialogue_id": len(self.dialogue_buffer) - 1}
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added dialogue from %s: %.50s...", speaker, content)
+        return {"status": "buffered", "dialogue_id": len(self._speakers) - 1}
     
     def add_dialogues_batch(self, dialogues: List[Dict[str, str]]) -> Dict[str, Any]:
         """Add multiple dialogues efficiently"""
-        for d in dialogues:
-            self.add_dialogue(d["speaker"], d["content"], d["timestamp"])
+        if dialogues:
+            speakers, contents, timestamps = zip(*[
+                (sys.intern(d["speaker"]), d["content"], d["timestamp"]) for d in dialogues
+            ])
+            ts_us = [epoch_us(ts) for ts in timestamps]
+            self._speakers.extend(speakers)
+            self._contents.extend(contents)
+            self._timestamps.extend(timestamps)
+            self._ts_us.extend(ts_us)
+            self.metadata["total_dialogues"] += len(dialogues)
+        logger.info("Added batch of %d dialogues", len(dialogues))
         return {
             "status": "buffered",
             "count": len(dialogues),
-            "total_buffered": len(self.dialogue_buffer)
+            "total_buffered": len(self._speakers)
         }
     
     def finalize(self) -> Dict[str, Any]:
@@ -85,28 +211,33 @@ class MockSimpleMemSystem:
         Process buffered dialogues into atomic memory entries.
         This is where SimpleMem's semantic compression happens.
         """
-        if not self.dialogue_buffer:
+        if not self._speakers:
             return {"status": "no_dialogues_to_process"}
         
         # Mock processing - in reality this would:
         # 1. Apply semantic filtering
         # 2. Extract atomic facts with coreference resolution
         # 3. Create multi-view indexes (semantic + lexical + symbolic)
-        num_processed = len(self.dialogue_buffer)
+        num_processed = len(self._speakers)
         
         # Simulate atomic fact extraction
-        for dialogue in self.dialogue_buffer:
-            atomic_fact = {
-                "speaker": dialogue["speaker"],
-                "fact": dialogue["content"],  # Would be transformed
-                "timestamp": dialogue["timestamp"],
-                "embedding_id": f"emb_{len(self.memory_entries)}"
-            }
-            self.memory_entries.append(atomic_fact)
-            self.metadata["total_atoms"] += 1
+        base = len(self._atoms["fact"])
+        atoms = (
+            self._speakers,
+            self._contents,  # Would be transformed
+            self._timestamps,
+            self._ts_us,
+            [f"emb_{i}" for i in range(base, base + num_processed)]
+        )
+        # Persist before touching the in-memory store: if the write fails,
+        # the dialogues stay buffered and nothing is added twice on retry
+        self._persist_atoms(*atoms)
+        self._append_atoms(*atoms)
         
-        self.dialogue_buffer = []
-        self.metadata["last_finalized"] = datetime.now().isoformat()
+        self._clear_buffer()
+        # Raw epoch ns; formatted lazily in get_stats
+        self.metadata["last_finalized_ns"] = time_ns()
+        self._memory_version += 1
         
         logger.info(f"Finalized {num_processed} dialogues into atomic entries")
         return {
@@ -115,28 +246,100 @@ class MockSimpleMemSystem:
             "total_atoms": self.metadata["total_atoms"]
         }
     
+    def _append_atoms(
+        self,
+        speakers: List[str],
+        facts: List[str],
+        timestamps: List[str],
+        ts_us: Iterable[int],
+        embedding_ids: List[str]
+    ) -> None:
+        """Append atom columns to the store along with their display lines"""
+        self._atoms["speaker"].extend(speakers)
+        self._atoms["fact"].extend(facts)
+        self._atoms["timestamp"].extend(timestamps)
+        self._atoms["embedding_id"].extend(embedding_ids)
+        self._atom_ts_us.extend(ts_us)
+        self._display_lines.extend([
+            f"[{timestamp}] {speaker}: {fact}"
+            for speaker, fact, timestamp in zip(speakers, facts, timestamps)
+        ])
+        self.metadata["total_atoms"] += len(facts)
+    
+    def _persist_atoms(
+        self,
+        speakers: List[str],
+        facts: List[str],
+        timestamps: List[str],
+        ts_us: array,
+        embedding_ids: List[str]
+    ) -> None:
+        """
+        Append atom columns to the on-disk log as one Arrow record batch.
+        
+        The log is a schema message followed by raw record-batch messages, so
+        appending never rewrites earlier data. No-op without pyarrow.
+        """
+        if pa is None:
+            return
+        columns = [speakers, facts, timestamps, embedding_ids, ts_us.tolist()]
+        batch = pa.record_batch(columns, schema=_ATOM_LOG_SCHEMA)
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        new_log = not self._log_path.exists()
+        with open(self._log_path, "ab") as f:
+            if new_log:
+                f.write(_ATOM_LOG_SCHEMA.serialize())
+            f.write(batch.serialize())
+    
+    def _restore_atoms(self) -> None:
+        """Reload finalized atoms from the memory-mapped on-disk log"""
+        with pa.memory_map(str(self._log_path)) as source:
+            batches = []
+            try:
+                for batch in pa.ipc.open_stream(source):
+                    batches.append(batch)
+            except (pa.ArrowInvalid, OSError) as e:
+                # A crash mid-append leaves a torn final batch; keep the rest
+                # and rewrite the log without it so later appends stay readable
+                logger.warning(f"Dropping unreadable tail of {self._log_path}: {e}")
+                tmp_path = self._log_path.with_suffix(".arrow.tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(_ATOM_LOG_SCHEMA.serialize())
+                    for batch in batches:
+                        f.write(batch.serialize())
+                os.replace(tmp_path, self._log_path)
+            table = pa.Table.from_batches(batches, schema=_ATOM_LOG_SCHEMA)
+            columns = table.to_pydict()
+        self._append_atoms(
+            [sys.intern(speaker) for speaker in columns["speaker"]],
+            columns["fact"],
+            columns["timestamp"],
+            columns["ts_us"],
+            columns["embedding_id"]
+        )
+        self.metadata["total_dialogues"] = self.metadata["total_atoms"]
+        logger.info(f"Restored {table.num_rows} atomic entries from {self._log_path}")
+    
     def ask(self, query: str, top_k: int = 5) -> str:
         """
         Query memory with adaptive retrieval.
         In production, this would:
         1. Estimate query complexity
         2. Perform hybrid retrieval (semantic + lexical + symbolic)
-        3. Apply reciprocal rank fusion
+        3. Apply reciprocal rank fusion (simplemem_kernels.rrf_merge)
         4. Construct context efficiently
         """
         logger.info(f"Query received: {query}")
-        
-        if not self.memory_entries:
+        return self._ask_cached(query, top_k, self._memory_version)
+    
+    def _answer(self, query: str, top_k: int, memory_version: int) -> str:
+        """Build the answer for ask(); memoized per memory version"""
+        if not self._atoms["fact"]:
             return "No memories stored yet. Please add dialogues and finalize."
         
         # Mock retrieval - would use vector similarity + BM25 + metadata filters
-        relevant_entries = self.memory_entries[:min(top_k, len(self.memory_entries))]
-        
         # Mock answer generation
-        context = "\n".join([
-            f"[{e['timestamp']}] {e['speaker']}: {e['fact']}"
-            for e in relevant_entries
-        ])
+        context = "\n".join(self._display_lines[:top_k])
         
         answer = f"""Based on memory retrieval:
 
@@ -154,29 +357,65 @@ Note: This is a mock implementation. Production SimpleMem would use:
 """
         return answer
     
-    def get_atomic_entries(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Retrieve raw atomic memory entries"""
-        return self.memory_entries[:limit]
+    def get_atomic_entries(self, limit: int = 10, since: Optional[str] = None) -> List[Atom]:
+        """Retrieve raw atomic memory entries, optionally only those at or after `since`"""
+        if since is None:
+            columns = [self._atoms[field][:limit] for field in _ATOM_FIELDS]
+            return [Atom(*row) for row in zip(*columns)]
+        cutoff_us = epoch_us(since)
+        matches = islice(
+            (i for i, ts_us in enumerate(self._atom_ts_us) if ts_us >= cutoff_us),
+            max(limit, 0)
+        )
+        return [Atom(*(self._atoms[field][i] for field in _ATOM_FIELDS)) for i in matches]
+    
+    def to_arrow(self) -> "pa.Table":
+        """Export atomic memory entries as a pyarrow Table (e.g. for LanceDB)"""
+        if pa is None:
+            raise ImportError("pyarrow is required for Arrow export. Install with: pip install pyarrow")
+        # Speaker is dictionary-encoded: the storage-level analogue of interning
+        schema = pa.schema([
+            (field, pa.dictionary(pa.int32(), pa.string()) if field == "speaker" else pa.string())
+            for field in _ATOM_FIELDS
+        ])
+        return pa.table({field: self._atoms[field] for field in _ATOM_FIELDS}, schema=schema)
+    
+    def _clear_buffer(self) -> None:
+        """Drop all buffered (not yet finalized) dialogues"""
+        self._speakers = []
+        self._contents = []
+        self._timestamps = []
+        self._ts_us = array("q")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics"""
+        last_finalized_ns = self.metadata["last_finalized_ns"]
+        last_finalized = (
+            datetime.fromtimestamp(last_finalized_ns / 1e9).isoformat()
+            if last_finalized_ns is not None else None
+        )
         return {
             "total_dialogues_processed": self.metadata["total_dialogues"],
             "total_atomic_entries": self.metadata["total_atoms"],
-            "buffered_dialogues": len(self.dialogue_buffer),
-            "last_finalized": self.metadata["last_finalized"],
+            "buffered_dialogues": len(self._speakers),
+            "last_finalized": last_finalized,
             "database_path": self.db_path
         }
     
     def clear(self) -> Dict[str, Any]:
         """Clear all memory"""
-        self.dialogue_buffer = []
-        self.memory_entries = []
+        self._clear_buffer()
+        self._atoms = {field: [] for field in _ATOM_FIELDS}
+        self._atom_ts_us = array("q")
+        self._display_lines = []
+        self._log_path.unlink(missing_ok=True)
         self.metadata = {
             "total_dialogues": 0,
             "total_atoms": 0,
-            "last_finalized": None
+            "last_finalized_ns": None
         }
+        self._memory_version += 1
+        self._ask_cached.cache_clear()
         logger.warning("Memory cleared!")
         return {"status": "cleared"}
 
@@ -189,16 +428,18 @@ simplemem_system = MockSimpleMemSystem(db_path="./simplemem_mcp_data")
 app = Server("simplemem-paperagent")
 
 
-@app.list_tools()
-async def list_tools() -> List[Tool]:
+@cache
+def _tools() -> List[Tool]:
     """
-    Define available MCP tools for SimpleMem.
-    Each tool corresponds to a SimpleMem capability.
+    MCP tool definitions, built (and descriptions dedented) on first use.
+    
+    The list is static, so later tools/list requests get the same objects and
+    a server that never lists its tools never builds them.
     """
     return [
         Tool(
             name="add_dialogue",
-            description="""
+            description=dedent("""
             Add a single dialogue turn to SimpleMem's memory buffer.
             
             SimpleMem will apply semantic filtering and coreference resolution 
@@ -208,7 +449,7 @@ async def list_tools() -> List[Tool]:
             - speaker: Name of the person speaking
             - content: What they said (can include relative references like "tomorrow")
             - timestamp: ISO format datetime (e.g., "2025-01-20T14:30:00")
-            """,
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -221,7 +462,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="add_dialogues_batch",
-            description="""
+            description=dedent("""
             Add multiple dialogue turns efficiently (recommended for >1 turn).
             
             This is more efficient than calling add_dialogue multiple times.
@@ -229,7 +470,7 @@ async def list_tools() -> List[Tool]:
             
             Parameters:
             - dialogues: Array of {speaker, content, timestamp} objects
-            """,
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -251,7 +492,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="finalize_memory",
-            description="""
+            description=dedent("""
             Process buffered dialogues into atomic memory entries.
             
             ⚠️ IMPORTANT: Always call this after adding dialogues!
@@ -263,7 +504,7 @@ async def list_tools() -> List[Tool]:
             
             SimpleMem uses windowed processing (40 dialogues/window),
             so call this to ensure all dialogues are processed.
-            """,
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {},
@@ -272,7 +513,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="ask_memory",
-            description="""
+            description=dedent("""
             Query SimpleMem with adaptive complexity-aware retrieval.
             
             SimpleMem automatically:
@@ -286,7 +527,7 @@ async def list_tools() -> List[Tool]:
             Parameters:
             - query: Natural language question
             - top_k: Base retrieval depth (default: 5, adjusted by complexity)
-            """,
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -298,7 +539,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="get_memory_stats",
-            description="""
+            description=dedent("""
             Get SimpleMem system statistics and metadata.
             
             Returns:
@@ -307,7 +548,7 @@ async def list_tools() -> List[Tool]:
             - Buffered dialogues awaiting finalization
             - Last finalization timestamp
             - Database path
-            """,
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {},
@@ -316,7 +557,7 @@ async def list_tools() -> List[Tool]:
         ),
         Tool(
             name="get_atomic_entries",
-            description="""
+            description=dedent("""
             View raw atomic memory entries (for debugging/inspection).
             
             Returns the actual atomic facts stored in SimpleMem's database.
@@ -327,18 +568,20 @@ async def list_tools() -> List[Tool]:
             
             Parameters:
             - limit: Maximum number of entries to return (default: 10)
-            """,
+            - since: Only return entries at or after this ISO timestamp (optional)
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "limit": {"type": "integer", "description": "Max entries", "default": 10}
+                    "limit": {"type": "integer", "description": "Max entries", "default": 10},
+                    "since": {"type": "string", "description": "Only entries at or after this ISO timestamp"}
                 },
                 "required": []
             }
         ),
         Tool(
             name="clear_memory",
-            description="""
+            description=dedent("""
             Clear all memory from SimpleMem (⚠️ destructive operation).
             
             Use with caution! This removes:
@@ -347,7 +590,7 @@ async def list_tools() -> List[Tool]:
             - All indexes
             
             Useful for starting fresh or testing.
-            """,
+            """),
             inputSchema={
                 "type": "object",
                 "properties": {},
@@ -357,56 +600,85 @@ async def list_tools() -> List[Tool]:
     ]
 
 
-@app.call_tool()
+# Whether tool arguments are validated with precompiled fastjsonschema
+# validators (which also fill in schema defaults). Otherwise MCP's own
+# (interpreted) jsonschema validation is used instead.
+_USE_COMPILED_VALIDATORS = fastjsonschema is not None
+
+
+@cache
+def _validators() -> Dict[str, Callable[[Any], Any]]:
+    """Tool name -> compiled inputSchema validator, compiled on first use"""
+    return {tool.name: fastjsonschema.compile(tool.inputSchema) for tool in _tools()}
+
+
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """
+    Define available MCP tools for SimpleMem.
+    Each tool corresponds to a SimpleMem capability.
+    """
+    return _tools()
+
+
+def _handle_ask_memory(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    answer = simplemem_system.ask(arguments["query"], arguments.get("top_k", 5))
+    return {"answer": answer}
+
+
+def _handle_get_atomic_entries(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    entries = simplemem_system.get_atomic_entries(
+        arguments.get("limit", 10),
+        since=arguments.get("since")
+    )
+    return {"entries": [asdict(e) for e in entries], "count": len(entries)}
+
+
+# Tool name -> handler taking the call arguments and returning a JSON-able result
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "add_dialogue": lambda a: simplemem_system.add_dialogue(
+        speaker=a["speaker"],
+        content=a["content"],
+        timestamp=a["timestamp"]
+    ),
+    "add_dialogues_batch": lambda a: simplemem_system.add_dialogues_batch(
+        dialogues=a["dialogues"]
+    ),
+    "finalize_memory": lambda a: simplemem_system.finalize(),
+    "ask_memory": _handle_ask_memory,
+    "get_memory_stats": lambda a: simplemem_system.get_stats(),
+    "get_atomic_entries": _handle_get_atomic_entries,
+    "clear_memory": lambda a: simplemem_system.clear(),
+}
+
+
+@app.call_tool(validate_input=not _USE_COMPILED_VALIDATORS)
 async def call_tool(name: str, arguments: Any) -> List[TextContent]:
     """
     Handle MCP tool calls.
     Routes requests to appropriate SimpleMem methods.
     """
+    validator = _validators().get(name) if _USE_COMPILED_VALIDATORS else None
+    if validator is not None:
+        try:
+            arguments = validator(arguments)
+        except fastjsonschema.JsonSchemaException as e:
+            # Raised out of the handler so MCP reports it as an error result
+            # (isError), the same as its own jsonschema validation
+            raise ValueError(f"Input validation error: {e.message}") from None
+    
     try:
-        result = None
-        
-        if name == "add_dialogue":
-            result = simplemem_system.add_dialogue(
-                speaker=arguments["speaker"],
-                content=arguments["content"],
-                timestamp=arguments["timestamp"]
-            )
-        
-        elif name == "add_dialogues_batch":
-            result = simplemem_system.add_dialogues_batch(
-                dialogues=arguments["dialogues"]
-            )
-        
-        elif name == "finalize_memory":
-            result = simplemem_system.finalize()
-        
-        elif name == "ask_memory":
-            query = arguments["query"]
-            top_k = arguments.get("top_k", 5)
-            answer = simplemem_system.ask(query, top_k)
-            result = {"answer": answer}
-        
-        elif name == "get_memory_stats":
-            result = simplemem_system.get_stats()
-        
-        elif name == "get_atomic_entries":
-            limit = arguments.get("limit", 10)
-            entries = simplemem_system.get_atomic_entries(limit)
-            result = {"entries": entries, "count": len(entries)}
-        
-        elif name == "clear_memory":
-            result = simplemem_system.clear()
-        
-        else:
+        handler = _HANDLERS.get(name)
+        if handler is None:
             return [TextContent(
                 type="text",
                 text=f"Unknown tool: {name}"
             )]
         
+        result = handler(arguments)
+        
         # Format response
-        response_text = json.dumps(result, indent=2)
-        return [TextContent(type="text", text=response_text)]
+        return [_make_response(result)]
     
     except Exception as e:
         logger.error(f"Error in tool {name}: {e}", exc_info=True)
@@ -426,6 +698,7 @@ async def main():
     logger.info("Starting SimpleMem PaperAgent MCP Server...")
     logger.info("Based on: SimpleMem (Liu et al., 2025)")
     logger.info("GitHub: https://github.com/aiming-lab/SimpleMem")
+    _log_buffer.flush()
     
     async with stdio_server() as (read_stream, write_stream):
         await app.run(
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+SimpleMem Retrieval - Multi-View Hybrid Retrieval
+=================================================
+
+Reference implementation of SimpleMem's Stage 3 retrieval used by the
+Paper2Agent `analyze_multi_view_retrieval` tool:
+
+1. Semantic: vector similarity over 1024-d fact embeddings
+2. Lexical: BM25 keyword matching
+3. Symbolic: metadata matching (entities, dates)
+
+The three ranked lists are merged with Reciprocal Rank Fusion (RRF).
+
+Embeddings here come from a deterministic feature-hashing encoder so the
+tool runs without a model download; swap in a real encoder for production.
+
+Author: Tanya (Stanford Biomedical Data Science)
+Based on: SimpleMem by Liu et al. (2025)
+License: MIT
+"""
+
+import hashlib
+import re
+import shutil
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from simplemem_kernels import (
+    BM25_B, BM25_K1, RRF_K, fused_scan, quantize_rows, rrf_merge, topk
+)
+from simplemem_temporal import epoch_us, resolve_temporal
+
+# Optional Arrow reader for databases written by the SimpleMem MCP server
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Optional approximate nearest-neighbour search (pip install hnswlib)
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+EMBEDDING_DIM = 1024
+
+# Identifies the encoder below in embedding cache keys
+EMBEDDING_MODEL = "feature-hash-crc32-1024"
+
+# HNSW graph parameters for the semantic view. Below HNSW_MIN_FACTS facts the
+# exact int8 scan is fast enough and is used instead.
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+HNSW_MIN_FACTS = 1000
+
+# Subdirectory of a MultiViewIndex cache_dir holding the persisted index
+# files; only files in here are ever replaced or deleted
+INDEX_DIRNAME = ".index"
+
+_TOKEN_RE = re.compile(r"\w+")
+_ENTITY_RE = re.compile(r"\b[A-Z][a-z]+\b")
+_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+# Connectives that chain facts together (multi-hop / temporal-order questions)
+_HOP_RE = re.compile(r"\b(?:and|then|after|before|because|while|between|compare|both)\b", re.IGNORECASE)
+
+# Feature counts at which each query-complexity component saturates at 1
+COMPLEXITY_TOKENS = 20
+COMPLEXITY_HOPS = 3
+COMPLEXITY_ENTITIES = 3
+
+# Atomic facts from the SimpleMem paper's running example, used when no
+# populated memory database is available.
+DEMO_MEMORIES: List[Dict[str, str]] = [
+    {"speaker": "Alice", "fact": "Alice will meet Bob at Starbucks on 2025-11-16T14:00:00",
+     "timestamp": "2025-11-15T09:12:00"},
+    {"speaker": "Bob", "fact": "Bob prefers oat milk lattes at Starbucks",
+     "timestamp": "2025-11-15T09:14:00"},
+    {"speaker": "Alice", "fact": "Alice is preparing the quarterly budget review due on 2025-11-20",
+     "timestamp": "2025-11-15T09:20:00"},
+    {"speaker": "Carol", "fact": "Carol moved the design sync with Alice to 2025-11-18T10:00:00",
+     "timestamp": "2025-11-16T08:05:00"},
+    {"speaker": "Bob", "fact": "Bob will travel to Seattle on 2025-11-21 for a conference",
+     "timestamp": "2025-11-16T17:40:00"},
+    {"speaker": "Alice", "fact": "Alice adopted a golden retriever named Max on 2025-10-02",
+     "timestamp": "2025-11-17T12:30:00"},
+    {"speaker": "Carol", "fact": "Carol recommended the Thai restaurant near the office to Bob",
+     "timestamp": "2025-11-17T13:10:00"},
+    {"speaker": "Bob", "fact": "Bob finished reading the SimpleMem paper on lifelong memory",
+     "timestamp": "2025-11-18T20:45:00"},
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def query_complexity(queries: List[str]) -> np.ndarray:
+    """
+    Complexity score C_q in [0, 1] for every query.
+
+    C_q is the mean of three saturating features: query length, number of
+    chaining connectives (multi-hop cues) and number of distinct entities.
+    Each feature is extracted for the whole batch into one array and the
+    scoring is a handful of vectorized NumPy operations.
+    """
+    n = len(queries)
+    tokens = np.fromiter((len(tokenize(q)) for q in queries), dtype=np.float64, count=n)
+    hops = np.fromiter((len(_HOP_RE.findall(q)) for q in queries), dtype=np.float64, count=n)
+    entities = np.fromiter((len(set(_ENTITY_RE.findall(q))) for q in queries), dtype=np.float64, count=n)
+    return (
+        np.minimum(tokens / COMPLEXITY_TOKENS, 1.0)
+        + np.minimum(hops / COMPLEXITY_HOPS, 1.0)
+        + np.minimum(entities / COMPLEXITY_ENTITIES, 1.0)
+    ) / 3.0
+
+
+def adaptive_depth(complexity: np.ndarray, k_base: int, delta: float) -> np.ndarray:
+    """Retrieval depth per query: k_dyn = ⌊k_base × (1 + δ × C_q)⌋"""
+    return np.floor(k_base * (1.0 + delta * complexity)).astype(np.int64)
+
+
+def embed(text: str) -> np.ndarray:
+    """
+    Embed text into a unit-length EMBEDDING_DIM vector via feature hashing.
+
+    Each token is hashed (CRC32, stable across processes) to a dimension and
+    a sign; texts sharing words get high cosine similarity.
+    """
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for token in tokenize(text):
+        h = zlib.crc32(token.encode("utf-8"))
+        vec[h % EMBEDDING_DIM] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+
+def embed_batch(texts: List[str]) -> np.ndarray:
+    """
+    Embed many texts at once; row i equals embed(texts[i]).
+
+    All token hashes are scattered into the (N, EMBEDDING_DIM) matrix with a
+    single np.add.at and the rows normalized together.
+    """
+    rows: List[int] = []
+    hashes: List[int] = []
+    for i, text in enumerate(texts):
+        for token in tokenize(text):
+            rows.append(i)
+            hashes.append(zlib.crc32(token.encode("utf-8")))
+    h = np.array(hashes, dtype=np.uint32)
+    signs = np.where((h >> 31) & 1, 1.0, -1.0).astype(np.float32)
+    mat = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    np.add.at(mat, (np.array(rows, dtype=np.int64), h % EMBEDDING_DIM), signs)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return np.divide(mat, norms, out=mat, where=norms > 0)
+
+
+def normalize_rows(mat: np.ndarray) -> np.ndarray:
+    """C-contiguous float32 copy of `mat` with unit-length rows (zero rows stay zero)"""
+    mat = np.array(mat, dtype=np.float32, order="C")
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return np.divide(mat, norms, out=mat, where=norms > 0)
+
+
+def load_memories(memory_db: str) -> List[Dict[str, str]]:
+    """
+    Load atomic facts from a SimpleMem MCP server database directory.
+
+    Reads `<memory_db>/atoms.arrow` when it exists and pyarrow is installed;
+    otherwise returns an empty list. Like the MCP server's restore, reading
+    stops at a torn final batch (a crash mid-append) and keeps the rest; the
+    file itself is left for the server to repair.
+    """
+    log_path = Path(memory_db) / "atoms.arrow"
+    if pa is None or not log_path.exists():
+        return []
+    with pa.memory_map(str(log_path)) as source:
+        batches = []
+        try:
+            for batch in pa.ipc.open_stream(source):
+                batches.append(batch)
+        except (pa.ArrowInvalid, OSError):
+            pass
+        if not batches:
+            return []
+        table = pa.Table.from_batches(batches)
+        return table.select(["speaker", "fact", "timestamp"]).to_pylist()
+
+
+def _epoch_us(timestamp: str) -> Optional[int]:
+    """simplemem_temporal.epoch_us, or None if `timestamp` is unparseable"""
+    try:
+        return epoch_us(timestamp)
+    except ValueError:
+        return None
+
+
+class FactTable:
+    """
+    Columnar (structure-of-arrays) store of atomic facts, backed by a pyarrow Table.
+
+    Each field is one Arrow column instead of one dict per fact: all fact
+    strings share a single data buffer addressed by offsets, speakers are
+    dictionary-encoded, timestamps are also kept as int64 µs, and the
+    resolution columns are nullable. Scans over a column touch only that
+    column's memory.
+
+    Columns: speaker, original, atomic, timestamp, ts_us, coreference,
+    temporal, location
+    """
+    SCHEMA = pa.schema([
+        ("speaker", pa.dictionary(pa.int32(), pa.string())),
+        ("original", pa.string()),
+        ("atomic", pa.string()),
+        ("timestamp", pa.string()),
+        ("ts_us", pa.int64()),
+        ("coreference", pa.string()),
+        ("temporal", pa.string()),
+        ("location", pa.string()),
+    ]) if pa is not None else None
+
+    RESOLUTIONS = ("coreference", "temporal", "location")
+
+    def __init__(self, table: "pa.Table"):
+        self.table = table
+
+    @classmethod
+    def from_dialogues(cls, dialogues: List[Dict[str, str]]) -> "FactTable":
+        """
+        One atomic fact per dialogue turn, with the content taken as-is.
+
+        Relative times are anchored to each turn's timestamp into the
+        temporal column (simplemem_temporal, one scan over all turns).
+        Coreference and location stay null: those are resolved by SimpleMem's
+        LLM compressor, which this reference build omits.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for FactTable. Install with: pip install pyarrow")
+        texts = [d["content"] for d in dialogues]
+        contents = pa.array(texts, type=pa.string())
+        timestamps = [d["timestamp"] for d in dialogues]
+        nulls = pa.nulls(len(dialogues), type=pa.string())
+        return cls(pa.table([
+            pa.array([d["speaker"] for d in dialogues], type=pa.string()).dictionary_encode(),
+            contents,
+            contents,
+            pa.array(timestamps, type=pa.string()),
+            pa.array([_epoch_us(t) for t in timestamps], type=pa.int64()),
+            nulls,
+            pa.array(resolve_temporal(texts, timestamps), type=pa.string()),
+            nulls,
+        ], schema=cls.SCHEMA))
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the column buffers"""
+        return self.table.nbytes
+
+    def to_dict_view(self, i: int) -> Dict[str, Any]:
+        """Fact i in the legacy {original, atomic, resolutions: {...}} dict shape"""
+        row = self.table.slice(i, 1).to_pylist()[0]
+        return {
+            "original": row["original"],
+            "atomic": row["atomic"],
+            "resolutions": {k: row[k] for k in self.RESOLUTIONS if row[k] is not None},
+        }
+
+    def write(self, path: str) -> None:
+        """Save as an Arrow IPC file"""
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, self.table.schema) as writer:
+            writer.write_table(self.table)
+
+    @classmethod
+    def open(cls, path: str) -> "FactTable":
+        """Memory-map an Arrow IPC file written by write() (zero-copy)"""
+        return cls(pa.ipc.open_file(pa.memory_map(str(path))).read_all())
+
+
+class MultiViewIndex:
+    """
+    Semantic + lexical + symbolic indexes over a list of atomic facts.
+
+    The semantic view keeps every fact embedding L2-normalized and quantized
+    to int8 with one float32 scale per row: a contiguous (N, EMBEDDING_DIM)
+    int8 matrix is a quarter of the float32 size, and scoring a query is one
+    int8 x int8 -> int32 pass over it (see view_scores).
+    With hnswlib installed and at least HNSW_MIN_FACTS facts, semantic top-k
+    comes from an HNSW graph instead, sub-linear in N.
+
+    Parameters:
+    - memories: [{speaker, fact, timestamp}, ...]
+    - embed_fn: query encoder (e.g. CachedEmbedder.embed)
+    - embed_batch_fn: fact encoder, texts -> (N, dim) (e.g. CachedEmbedder.embed_many)
+    - cache_dir: where to persist the quantized embeddings (.npy), HNSW graph
+      and BM25 postings, in its INDEX_DIRNAME subdirectory; later builds over
+      the same facts load them instead of re-embedding and re-tokenizing
+    """
+    def __init__(
+        self,
+        memories: List[Dict[str, str]],
+        embed_fn: Callable[[str], np.ndarray] = embed,
+        embed_batch_fn: Callable[[List[str]], np.ndarray] = embed_batch,
+        cache_dir: Optional[str] = None
+    ):
+        self.memories = memories
+        self.embed_fn = embed_fn
+        facts = [m["fact"] for m in memories]
+        # Fingerprint of the encoder and every fact: names the cached files, so
+        # any change to the memory set maps to different ones
+        h = hashlib.blake2b(EMBEDDING_MODEL.encode("utf-8"), digest_size=8)
+        for fact in facts:
+            h.update(fact.encode("utf-8"))
+            h.update(b"\0")
+        self.fingerprint = h.hexdigest()
+        index_dir = Path(cache_dir) / INDEX_DIRNAME if cache_dir is not None else None
+        self.codes, self.scales = self._build_semantic(facts, embed_batch_fn, index_dir)
+        self.ann = None
+        if hnswlib is not None and len(facts) >= HNSW_MIN_FACTS:
+            self.ann = self._build_ann(index_dir)
+        self._build_lexical(facts, index_dir)
+        self._build_symbolic(memories)
+        # The index never changes once built. Cached arrays are memory-mapped
+        # read-only; freezing fresh ones too means the JIT kernels see one
+        # array type either way (see simplemem_kernels.warm_kernels)
+        for name in ("codes", "scales", *self._LEXICAL_ARRAYS, "sym_indptr", "sym_indices"):
+            getattr(self, name).setflags(write=False)
+
+    def _build_semantic(
+        self,
+        facts: List[str],
+        embed_batch_fn: Callable[[List[str]], np.ndarray],
+        index_dir: Optional[Path]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """int8 fact codes and per-row scales, memory-mapped from index_dir when possible"""
+        if not facts:
+            return quantize_rows(np.zeros((0, EMBEDDING_DIM), dtype=np.float32))
+        if index_dir is None:
+            return quantize_rows(normalize_rows(embed_batch_fn(facts)))
+        codes_path = index_dir / f"embeddings-{self.fingerprint}.int8.npy"
+        scales_path = index_dir / f"embeddings-{self.fingerprint}.scales.npy"
+        if codes_path.exists() and scales_path.exists():
+            return np.load(codes_path, mmap_mode="r"), np.load(scales_path, mmap_mode="r")
+        codes, scales = quantize_rows(normalize_rows(embed_batch_fn(facts)))
+        try:
+            index_dir.mkdir(parents=True, exist_ok=True)
+            for stale in index_dir.glob("embeddings-*.npy"):
+                stale.unlink()
+            # Scales last: the codes file alone never counts as a cache hit
+            for path, arr in ((codes_path, codes), (scales_path, scales)):
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    np.save(f, arr)
+                tmp_path.replace(path)
+        except OSError:
+            pass  # read-only database directory: keep the in-memory arrays
+        return codes, scales
+
+    def _build_ann(self, index_dir: Optional[Path]) -> "hnswlib.Index":
+        """Cosine HNSW graph over the dequantized fact vectors, loaded from index_dir when possible"""
+        n = self.codes.shape[0]
+        index = hnswlib.Index(space="cosine", dim=EMBEDDING_DIM)
+        path = index_dir / f"hnsw-{self.fingerprint}.bin" if index_dir is not None else None
+        if path is not None and path.exists():
+            index.load_index(str(path), max_elements=n)
+            return index
+        index.init_index(max_elements=n, M=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION)
+        index.add_items(self.codes * self.scales[:, None], np.arange(n))
+        if path is not None:
+            try:
+                index_dir.mkdir(parents=True, exist_ok=True)
+                for stale in index_dir.glob("hnsw-*.bin"):
+                    stale.unlink()
+                tmp_path = path.with_suffix(".tmp")
+                index.save_index(str(tmp_path))
+                tmp_path.replace(path)
+            except OSError:
+                pass  # read-only database directory: keep the in-memory graph
+        return index
+
+    # BM25 index arrays persisted by _build_lexical, one .npy file each
+    _LEXICAL_ARRAYS = ("indptr", "indices", "tf", "doc_lens", "idf")
+
+    def _build_lexical(self, facts: List[str], index_dir: Optional[Path]) -> None:
+        """
+        Build the BM25 index as a doc-major CSR term-frequency matrix.
+
+        With an index_dir, the tokenized postings and vocabulary are saved to
+        index_dir/lexical-<fingerprint>/ and memory-mapped back on later
+        builds, so the corpus is only tokenized once.
+        """
+        cache = index_dir / f"lexical-{self.fingerprint}" if index_dir is not None else None
+        if cache is not None and cache.is_dir():
+            for name in self._LEXICAL_ARRAYS:
+                setattr(self, name, np.load(cache / f"{name}.npy", mmap_mode="r"))
+            terms = (cache / "vocab.txt").read_text(encoding="utf-8")
+            self.vocab = {t: i for i, t in enumerate(terms.split("\n") if terms else [])}
+            self.avgdl = float(self.doc_lens.mean()) if len(facts) else 1.0
+            return
+
+        doc_tokens = [Counter(tokenize(fact)) for fact in facts]
+        self.vocab: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        for tf in doc_tokens:
+            for term, count in tf.items():
+                indices.append(self.vocab.setdefault(term, len(self.vocab)))
+                data.append(count)
+            indptr.append(len(indices))
+        self.indptr = np.array(indptr, dtype=np.int32)
+        self.indices = np.array(indices, dtype=np.int32)
+        self.tf = np.array(data, dtype=np.float32)
+        self.doc_lens = np.array([sum(tf.values()) for tf in doc_tokens], dtype=np.float32)
+        self.avgdl = float(self.doc_lens.mean()) if len(doc_tokens) else 1.0
+        n = len(doc_tokens)
+        df = np.bincount(self.indices, minlength=len(self.vocab))
+        self.idf = np.log(1 + (n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        if cache is not None:
+            try:
+                index_dir.mkdir(parents=True, exist_ok=True)
+                for stale in index_dir.glob("lexical-*"):
+                    shutil.rmtree(stale)
+                # Write into a scratch directory and rename it into place, so
+                # a crash never leaves a partial index under the final name
+                tmp_dir = cache.with_name(cache.name + ".tmp")
+                tmp_dir.mkdir()
+                for name in self._LEXICAL_ARRAYS:
+                    np.save(tmp_dir / f"{name}.npy", getattr(self, name))
+                (tmp_dir / "vocab.txt").write_text("\n".join(self.vocab), encoding="utf-8")
+                tmp_dir.rename(cache)
+            except OSError:
+                pass  # read-only database directory: keep the in-memory index
+
+    def _build_symbolic(self, memories: List[Dict[str, str]]) -> None:
+        """Doc-major CSR of each fact's metadata symbols (entities incl. speaker, dates)"""
+        self.symbols: Dict[Tuple[str, str], int] = {}
+        sym_indptr = [0]
+        sym_indices: List[int] = []
+        for m in memories:
+            found = {("entity", e) for e in _ENTITY_RE.findall(m["fact"])} | {("entity", m["speaker"])}
+            found |= {("date", d) for d in _DATE_RE.findall(m["fact"])}
+            sym_indices.extend(self.symbols.setdefault(sym, len(self.symbols)) for sym in found)
+            sym_indptr.append(len(sym_indices))
+        self.sym_indptr = np.array(sym_indptr, dtype=np.int32)
+        self.sym_indices = np.array(sym_indices, dtype=np.int32)
+
+    def _query_terms(self, query: str) -> np.ndarray:
+        """Vocabulary ids of the query's tokens"""
+        return np.array(
+            [self.vocab[t] for t in tokenize(query) if t in self.vocab], dtype=np.int32
+        )
+
+    def _query_symbols(self, query: str) -> np.ndarray:
+        """Symbol ids of the query's entities and dates"""
+        found = {("entity", e) for e in _ENTITY_RE.findall(query)}
+        found |= {("date", d) for d in _DATE_RE.findall(query)}
+        return np.array(
+            sorted(self.symbols[sym] for sym in found if sym in self.symbols), dtype=np.int32
+        )
+
+    def _ann_topk(
+        self,
+        query: str,
+        top_k: int,
+        ef_search: int = HNSW_EF_SEARCH
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ids and cosine similarities of the top_k positive semantic matches
+        from the HNSW graph (ef_search trades recall for latency; it is raised
+        to top_k if smaller).
+        """
+        k = min(top_k, self.codes.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        self.ann.set_ef(max(ef_search, k))
+        labels, distances = self.ann.knn_query(self.embed_fn(query), k=k)
+        ids, sims = labels[0].astype(np.int64), 1.0 - distances[0]
+        keep = sims > 0
+        return ids[keep], sims[keep]
+
+    def view_scores(self, query: str, semantic: bool = True) -> np.ndarray:
+        """
+        Semantic, lexical and symbolic scores of every fact (rows 0-2) from
+        one fused pass over the index (simplemem_kernels.fused_scan).
+
+        semantic=False skips the embedding scan and leaves row 0 zero.
+        """
+        if semantic:
+            q_codes, q_scales = quantize_rows(normalize_rows(self.embed_fn(query)[None, :]))
+        else:
+            q_codes, q_scales = np.zeros((1, self.codes.shape[1]), dtype=np.int8), np.zeros(1, dtype=np.float32)
+        return fused_scan(
+            self.codes, self.scales, q_codes[0], q_scales[0], semantic,
+            self.indptr, self.indices, self.tf, self.doc_lens, self.idf,
+            self._query_terms(query), BM25_K1, BM25_B, self.avgdl,
+            self.sym_indptr, self.sym_indices, len(self.symbols), self._query_symbols(query)
+        )
+
+    @staticmethod
+    def _rank(scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and values of the top_k positive scores, best first"""
+        ids, values = topk(scores, top_k)
+        keep = values > 0
+        return ids[keep], values[keep]
+
+    def retrieve(self, query: str, top_k: int = 5, ef_search: int = HNSW_EF_SEARCH) -> Dict[str, Any]:
+        """
+        Run all three views and fuse them with RRF.
+
+        ef_search is the HNSW search breadth for the semantic view (ignored
+        when it uses an exact scan).
+
+        Returns:
+        - views: {view: [(doc_id, score), ...]} per view, best first
+        - merged: [(doc_id, rrf_score), ...] after fusion
+        - contributions: how many merged results each view also returned
+        """
+        # One pass scores every view; with an HNSW graph the semantic view
+        # comes from the graph instead and is left out of the scan
+        scores = self.view_scores(query, semantic=self.ann is None)
+        view_hits = {
+            "semantic": (
+                self._rank(scores[0], top_k) if self.ann is None
+                else self._ann_topk(query, top_k, ef_search)
+            ),
+            "lexical": self._rank(scores[1], top_k),
+            "symbolic": self._rank(scores[2], top_k),
+        }
+        view_ids = {view: ids for view, (ids, _) in view_hits.items()}
+        merged_ids, merged_scores = rrf_merge(
+            list(view_ids.values()), len(self.memories), top_k, k=RRF_K
+        )
+        merged = set(merged_ids.tolist())
+        return {
+            "views": {
+                view: [(int(d), float(s)) for d, s in zip(ids, scores)]
+                for view, (ids, scores) in view_hits.items()
+            },
+            "merged": [(int(d), float(s)) for d, s in zip(merged_ids, merged_scores)],
+            "contributions": {
+                view: len(merged & set(ids.tolist())) for view, ids in view_ids.items()
+            },
+        }
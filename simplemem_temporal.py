@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+SimpleMem Temporal - Relative Time Detection and Anchoring
+==========================================================
+
+Part of SimpleMem's Stage 1 (semantic structured compression): relative
+time expressions in dialogue ("tomorrow", "on Friday", "in 3 hours") are
+found and anchored to absolute dates using the turn's timestamp, e.g.
+"tomorrow" said on 2025-11-15 -> 2025-11-16.
+
+All dialogues are scanned in one pass over a single NUL-separated buffer.
+The matcher backend is picked at import, fastest available first:
+1. Hyperscan (pip install hyperscan): all patterns in one SIMD automaton
+2. RE2 (pip install google-re2): linear-time, no backtracking
+3. Python's re module
+
+Author: Tanya (Stanford Biomedical Data Science)
+Based on: SimpleMem by Liu et al. (2025)
+License: MIT
+"""
+
+import bisect
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Optional multi-pattern SIMD matcher (pip install hyperscan)
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional linear-time regex engine (pip install google-re2)
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Relative time expressions by kind, in priority order (earlier kinds win
+# when two matches start at the same position)
+TEMPORAL_PATTERNS: Dict[str, str] = {
+    "today": r"\b(?:today|tonight)\b",
+    "tomorrow": r"\btomorrow\b",
+    "yesterday": r"\byesterday\b",
+    "next_week": r"\bnext\s+week\b",
+    "last_week": r"\blast\s+week\b",
+    "offset": r"\bin\s+\d+\s+(?:minute|hour|day|week)s?\b",
+    "weekday": r"\b(?:" + "|".join(_WEEKDAYS) + r")\b",
+}
+
+_KINDS = list(TEMPORAL_PATTERNS)
+_OFFSET_RE = re.compile(r"(\d+)\s+(minute|hour|day|week)", re.IGNORECASE)
+
+if hyperscan is not None:
+    _hs_db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    _hs_db.compile(
+        expressions=[p.encode("utf-8") for p in TEMPORAL_PATTERNS.values()],
+        ids=list(range(len(_KINDS))),
+        elements=len(_KINDS),
+        flags=hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+    )
+    BACKEND = "hyperscan"
+else:
+    _combined = "(?i)" + "|".join(f"(?P<{kind}>{p})" for kind, p in TEMPORAL_PATTERNS.items())
+    # re.ASCII: \b and \w match Hyperscan's and RE2's ASCII word boundaries
+    _regex = re2.compile(_combined) if re2 is not None else re.compile(_combined, re.ASCII)
+    BACKEND = "re2" if re2 is not None else "re"
+
+
+def _scan_buffer(buf):
+    """(start, end, kind index) of every leftmost, non-overlapping match in buf"""
+    if hyperscan is None:
+        return [(m.start(), m.end(), _KINDS.index(m.lastgroup)) for m in _regex.finditer(buf)]
+
+    hits: List[Tuple[int, int, int]] = []
+
+    def on_match(kind: int, start: int, end: int, flags: int, context) -> None:
+        hits.append((start, end, kind))
+
+    _hs_db.scan(buf, match_event_handler=on_match)
+    # Hyperscan reports every match; keep the leftmost, then longest, then
+    # highest-priority one and drop anything overlapping it (regex semantics)
+    hits.sort(key=lambda h: (h[0], -h[1], h[2]))
+    spans: List[Tuple[int, int, int]] = []
+    for start, end, kind in hits:
+        if not spans or start >= spans[-1][1]:
+            spans.append((start, end, kind))
+    return spans
+
+
+def scan_temporal(texts: List[str]) -> List[List[Tuple[str, str]]]:
+    """
+    Find relative time expressions in every text with a single scan.
+
+    The texts are joined with NUL separators (Hyperscan scans UTF-8 bytes,
+    the regex backends scan str) and each match is mapped back to its text
+    by offset.
+
+    Parameters:
+    - texts: dialogue contents
+
+    Returns:
+    - per text, [(kind, matched text), ...] in order of appearance
+    """
+    parts = [t.encode("utf-8") for t in texts] if hyperscan is not None else texts
+    buf = (b"\0" if hyperscan is not None else "\0").join(parts)
+    starts = []
+    pos = 0
+    for part in parts:
+        starts.append(pos)
+        pos += len(part) + 1
+    found: List[List[Tuple[str, str]]] = [[] for _ in texts]
+    for start, end, kind in _scan_buffer(buf):
+        match = buf[start:end]
+        found[bisect.bisect_right(starts, start) - 1].append(
+            (_KINDS[kind], match.decode("utf-8") if isinstance(match, bytes) else match)
+        )
+    return found
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def epoch_us(timestamp: str) -> int:
+    """
+    Parse an ISO timestamp into integer microseconds since the epoch (naive = UTC).
+
+    Microseconds (datetime's own resolution) fit in int64 for every year
+    datetime supports, unlike nanoseconds (1677-2262 only). Raises ValueError
+    if `timestamp` is not ISO 8601.
+    """
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def anchor(kind: str, text: str, when: datetime) -> Optional[str]:
+    """
+    Absolute time for a relative expression `text` of `kind` said at `when`,
+    or None when it falls outside the representable date range
+    """
+    day = when.date()
+    try:
+        if kind == "today":
+            return day.isoformat()
+        if kind == "tomorrow":
+            return (day + timedelta(days=1)).isoformat()
+        if kind == "yesterday":
+            return (day - timedelta(days=1)).isoformat()
+        if kind == "next_week":
+            return (day + timedelta(weeks=1)).isoformat()
+        if kind == "last_week":
+            return (day - timedelta(weeks=1)).isoformat()
+        if kind == "weekday":
+            # The coming occurrence (today if it is that weekday)
+            ahead = (_WEEKDAYS.index(text.lower()) - day.weekday()) % 7
+            return (day + timedelta(days=ahead)).isoformat()
+        amount, unit = _OFFSET_RE.search(text).groups()
+        delta = timedelta(**{unit.lower() + "s": int(amount)})
+        if unit.lower() in ("minute", "hour"):
+            return (when + delta).isoformat(timespec="minutes")
+        return (day + delta).isoformat()
+    except OverflowError:
+        return None  # e.g. "tomorrow" on 9999-12-31, "in 100000000 days"
+
+
+def resolve_temporal(texts: List[str], timestamps: List[str]) -> List[Optional[str]]:
+    """
+    Anchor the relative time expressions in each text to its timestamp.
+
+    Returns:
+    - per text, "expr → absolute, ..." (e.g. "tomorrow → 2025-11-16"), or
+      None when it has no anchorable relative times or its timestamp is not
+      ISO 8601; expressions that cannot be anchored are left out
+    """
+    resolved: List[Optional[str]] = []
+    for matches, timestamp in zip(scan_temporal(texts), timestamps):
+        if not matches:
+            resolved.append(None)
+            continue
+        try:
+            when = datetime.fromisoformat(timestamp)
+        except ValueError:
+            resolved.append(None)
+            continue
+        anchored = [(text, anchor(kind, text, when)) for kind, text in matches]
+        resolved.append(", ".join(
+            f"{text} → {absolute}" for text, absolute in anchored if absolute is not None
+        ) or None)
+    return resolved